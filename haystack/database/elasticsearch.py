@@ -1,15 +1,57 @@
 import json
 import logging
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from string import Template
 
+import numpy as np
 from elasticsearch import Elasticsearch
-from elasticsearch.helpers import bulk, scan
+from elasticsearch.exceptions import NotFoundError
+from elasticsearch.helpers import parallel_bulk, scan, streaming_bulk
+from elasticsearch.serializer import JSONSerializer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from haystack.database.base import BaseDocumentStore, Document
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=64)
+def _compile_template(template_string):
+    # Template compiles its placeholder regex on construction; cache the compiled instances since the
+    # same custom_query string is reused for every request of a retriever
+    return Template(template_string)
+
+
+class _ORJSONSerializer(JSONSerializer):
+    """
+    Transport serializer backed by orjson. The stdlib json module encodes every float through its
+    slow repr path, which becomes a real CPU cost for bodies carrying a query_vector with thousands
+    of floats; orjson uses a native encoder and serializes numpy arrays directly.
+    """
+
+    def dumps(self, data):
+        # like JSONSerializer, don't serialize strings again
+        if isinstance(data, str):
+            return data
+        try:
+            return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            # fall back to the stdlib serializer (and its default() hooks) for exotic types
+            return super().dumps(data)
+
+    def loads(self, s):
+        try:
+            return orjson.loads(s)
+        except ValueError:
+            return super().loads(s)
+
+
 class ElasticsearchDocumentStore(BaseDocumentStore):
     def __init__(
         self,
@@ -29,10 +71,37 @@ class ElasticsearchDocumentStore(BaseDocumentStore):
         scheme="http",
         ca_certs=False,
         verify_certs=True,
-        create_index=True
+        create_index=True,
+        cache_size=100,
+        cache_ttl=60,
+        normalize_embeddings=True,
+        maxsize=32,
+        http_compress=True,
+        retry_on_timeout=True,
+        sniff_on_start=False,
+        sniff_on_connection_fail=False,
     ):
-        self.client = Elasticsearch(hosts=[{"host": host}], http_auth=(username, password),
-                                    scheme=scheme, ca_certs=ca_certs, verify_certs=verify_certs)
+        # maxsize keeps up to that many persistent TCP connections alive across requests (relevant
+        # for high-QPS retrieval); http_compress gzips the request/response bodies, which shrinks
+        # dense_vector and _source payloads considerably for a small CPU cost. Sniffing is off by
+        # default because port-mapped single-node setups (like the docker-compose file in this repo)
+        # advertise container-internal addresses that are unreachable from the client.
+        client_kwargs = dict(hosts=[{"host": host}], http_auth=(username, password),
+                             scheme=scheme, ca_certs=ca_certs, verify_certs=verify_certs,
+                             maxsize=maxsize, http_compress=http_compress,
+                             retry_on_timeout=retry_on_timeout, sniff_on_start=sniff_on_start,
+                             sniff_on_connection_fail=sniff_on_connection_fail)
+        if orjson:
+            client_kwargs["serializer"] = _ORJSONSerializer()
+        self._client_kwargs = client_kwargs  # reused by AsyncElasticsearchDocumentStore
+        self.client = Elasticsearch(**client_kwargs)
+
+        # native approximate kNN search (HNSW) via the knn option in the search body is only
+        # available from Elasticsearch 8.4 onwards (8.0-8.3 expose it solely through the separate
+        # _knn_search endpoint)
+        es_version = self.client.info()["version"]["number"]
+        major, minor = (int(num) for num in es_version.split(".")[:2])
+        self.knn_supported = (major, minor) >= (8, 4)
 
         # if no custom_mapping is supplied, use the default mapping
         if not custom_mapping:
@@ -48,6 +117,10 @@ class ElasticsearchDocumentStore(BaseDocumentStore):
             if embedding_field:
                 custom_mapping["mappings"]["properties"][embedding_field] = {"type": "dense_vector",
                                                                              "dims": embedding_dim}
+                if self.knn_supported:
+                    # index the vectors in an HNSW graph so that query_by_embedding() can use approximate kNN
+                    custom_mapping["mappings"]["properties"][embedding_field]["index"] = True
+                    custom_mapping["mappings"]["properties"][embedding_field]["similarity"] = "cosine"
         # create an index if not exists
         if create_index:
             self.client.indices.create(index=index, ignore=400, body=custom_mapping)
@@ -65,42 +138,152 @@ class ElasticsearchDocumentStore(BaseDocumentStore):
         self.tag_fields = tag_fields
         self.external_source_id_field = external_source_id_field
         self.embedding_field = embedding_field
+        # L2-normalize vectors at index and query time, trading an index-time cost paid once for a
+        # cheaper dot-product scoring script on every query. Disable when vector magnitudes carry
+        # meaning and must be preserved in the index.
+        self.normalize_embeddings = normalize_embeddings
         self.excluded_meta_data = excluded_meta_data
+        # fields that never belong into Document.meta; precomputed for the per-hit conversion loop
+        self._meta_skip = frozenset((text_field, external_source_id_field))
+
+        # nothing on the read path uses the stored vectors, so never ship them back over HTTP -
+        # they dominate the _source payload (hundreds/thousands of floats per hit)
+        self._source_excludes = list(excluded_meta_data) if excluded_meta_data else []
+        if embedding_field and embedding_field not in self._source_excludes:
+            self._source_excludes.append(embedding_field)
+
+        # register the scoring script as a stored script once, so Elasticsearch does not recompile the
+        # Painless source on every query (only needed for the script_score fallback on ES < 8)
+        self._score_script_id = None
+        if embedding_field and not self.knn_supported:
+            if normalize_embeddings:
+                # vectors are normalized on ingest, so a plain dot product equals the cosine
+                # similarity and skips one norm per document in the scoring loop
+                self._score_script_id = f"haystack_dot_product_{embedding_field}"
+                score_script_source = f"dotProduct(params.query_vector,doc['{embedding_field}']) + 1.0"
+            else:
+                self._score_script_id = f"haystack_cosine_{embedding_field}"
+                score_script_source = f"cosineSimilarity(params.query_vector,doc['{embedding_field}']) + 1.0"
+            self.client.put_script(id=self._score_script_id, body={
+                "script": {
+                    "lang": "painless",
+                    "source": score_script_source,
+                }
+            })
+
+        # bounded LRU cache for query results, so repeated retrievals (e.g. reranking experiments on the
+        # same question) skip the network round trip. Set cache_size=0 to disable. Entries expire after
+        # cache_ttl seconds and all entries are invalidated whenever documents are written.
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache = OrderedDict()
+        self._cache_generation = 0
+
+    def _cache_key(self, index, body):
+        return self._cache_generation, index, json.dumps(body, sort_keys=True)
+
+    def _cache_get(self, key):
+        if self.cache_size <= 0:
+            return None
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        timestamp, result = entry
+        if time.time() - timestamp > self.cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return result
+
+    def _cache_put(self, key, result):
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = (time.time(), result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _invalidate_cache(self):
+        # bumping the generation makes all existing keys unreachable; stale entries age out via LRU
+        self._cache_generation += 1
 
     def get_document_by_id(self, id: str) -> Document:
-        query = {"query": {"ids": {"values": [id]}}}
-        result = self.client.search(index=self.index, body=query)["hits"]["hits"]
-
-        document = self._convert_es_hit_to_document(result[0]) if result else None
+        cache_key = self._cache_key(self.index, {"doc_id": id})
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        # a single-id lookup does not need the search phase: the realtime GET API reads straight
+        # from the translog / stored fields
+        try:
+            hit = self.client.get(index=self.index, id=id, _source_excludes=self._source_excludes or None)
+        except NotFoundError:
+            return None
+
+        document = self._convert_es_hit_to_document(hit)
+        self._cache_put(cache_key, document)
         return document
 
+    def get_documents_by_ids(self, ids: [str]) -> [Document]:
+        # one mget round trip instead of one GET per id - relevant when fetching all top-k candidates
+        # for reranking
+        if not ids:
+            return []  # Elasticsearch rejects an mget with an empty ids array
+        result = self.client.mget(index=self.index, body={"ids": ids},
+                                  _source_excludes=self._source_excludes or None)["docs"]
+        documents = [self._convert_es_hit_to_document(hit) for hit in result if hit.get("found")]
+        return documents
+
     def get_document_ids_by_tags(self, tags: dict) -> [str]:
         term_queries = [{"terms": {key: value}} for key, value in tags.items()]
-        query = {"query": {"bool": {"must": term_queries}}}
+        # constant_score puts the terms into filter context, so Elasticsearch can cache the bitsets
+        # and skip scoring entirely
+        # _source=False means Elasticsearch only ships the ids; scrolling via scan() also removes
+        # the silent truncation at 10k hits the previous size-limited search had
+        query = {
+            "query": {"constant_score": {"filter": {"bool": {"must": term_queries}}}},
+            "_source": False,
+        }
         logger.debug(f"Tag filter query: {query}")
-        result = self.client.search(index=self.index, body=query, size=10000)["hits"]["hits"]
-        doc_ids = []
-        for hit in result:
-            doc_ids.append(hit["_id"])
+        doc_ids = [hit["_id"] for hit in scan(self.client, query=query, index=self.index, size=10000)]
         return doc_ids
 
     def write_documents(self, documents):
-        for doc in documents:
-            doc["_op_type"] = "create"
-            doc["_index"] = self.index
-
-        bulk(self.client, documents, request_timeout=30)
+        def _actions(docs):
+            for doc in docs:
+                # store L2-normalized vectors so that query_by_embedding() can score with a plain dot
+                # product instead of re-deriving the document vector norm for every document on every query
+                if self.normalize_embeddings and self.embedding_field and self.embedding_field in doc:
+                    doc = dict(doc)
+                    emb = np.asarray(doc[self.embedding_field], dtype=np.float32)
+                    norm = np.linalg.norm(emb)
+                    if norm != 0:
+                        doc[self.embedding_field] = (emb / norm).tolist()
+                # keep the control metadata separate from _source so the caller's dicts are not mutated
+                yield {"_op_type": "create", "_index": self.index, "_source": doc}
+
+        # streaming_bulk raises BulkIndexError on failed actions (same semantics as the plain bulk
+        # helper); invalidate the cache even then, as some chunks may have been indexed already
+        try:
+            for _ in streaming_bulk(self.client, _actions(documents), chunk_size=1000, max_retries=3,
+                                    initial_backoff=1, request_timeout=30):
+                pass
+        finally:
+            self._invalidate_cache()
 
     def get_document_count(self):
-        result = self.client.count()
+        result = self.client.count(index=self.index)
         count = result["count"]
         return count
 
     def get_all_documents(self):
-        result = scan(self.client, query={"query": {"match_all": {}}}, index=self.index)
-        documents = [self._convert_es_hit_to_document(hit) for hit in result]
-
-        return documents
+        # generator: documents are converted while scrolling instead of being materialized all at
+        # once, so memory stays flat no matter how large the index is
+        body = {"query": {"match_all": {}}}
+        if self._source_excludes:
+            body["_source"] = {"excludes": self._source_excludes}
+        for hit in scan(self.client, query=body, index=self.index, size=1000):
+            yield self._convert_es_hit_to_document(hit)
 
     def query(
         self,
@@ -114,14 +297,30 @@ class ElasticsearchDocumentStore(BaseDocumentStore):
         if index is None:
             index = self.index
 
+        body = self._construct_query_body(query, filters, top_k, custom_query)
+
+        cache_key = self._cache_key(index, body)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        logger.debug(f"Retriever query: {body}")
+        result = self.client.search(index=index, body=body, request_cache=True)["hits"]["hits"]
+
+        documents = self._convert_es_hits_to_documents(result)
+        # cache a copy so callers mutating the returned list in place cannot corrupt the entry
+        self._cache_put(cache_key, list(documents))
+        return documents
+
+    def _construct_query_body(self, query, filters, top_k, custom_query):
         if custom_query:  # substitute placeholder for question and filters for the custom_query template string
-            template = Template(custom_query)
+            template = _compile_template(custom_query)
 
             substitutions = {"question": query}  # replace all "${question}" placeholder(s) with query
             # replace all filter values placeholders with a list of strings(in JSON format) for each filter
             if filters:
                 for key, values in filters.items():
-                    values_str = json.dumps(values)
+                    values_str = orjson.dumps(values).decode() if orjson else json.dumps(values)
                     substitutions[key] = values_str
             custom_query_json = template.substitute(**substitutions)
             body = json.loads(custom_query_json)
@@ -145,27 +344,74 @@ class ElasticsearchDocumentStore(BaseDocumentStore):
                     )
                 body["query"]["bool"]["filter"] = filter_clause
 
-        if self.excluded_meta_data:
-            body["_source"] = {"excludes": self.excluded_meta_data}
+        if self._source_excludes:
+            # setdefault: a custom_query template may bring its own _source clause
+            body.setdefault("_source", {"excludes": self._source_excludes})
+
+        # we only consume the top_k hits, so skip the exact total-hit accounting
+        body.setdefault("track_total_hits", False)
+        return body
+
+    def query_by_embedding(self, query_emb, top_k=10, candidate_doc_ids=None) -> [Document]:
+        body, score_adjustment = self._construct_embedding_query_body(query_emb, top_k, candidate_doc_ids)
+
+        cache_key = self._cache_key(self.index, body)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return list(cached)
 
         logger.debug(f"Retriever query: {body}")
-        result = self.client.search(index=index, body=body)["hits"]["hits"]
+        result = self.client.search(index=self.index, body=body)["hits"]["hits"]
 
-        documents = [self._convert_es_hit_to_document(hit) for hit in result]
+        documents = self._convert_es_hits_to_documents(result, score_adjustment=score_adjustment)
+        # cache a copy so callers mutating the returned list in place cannot corrupt the entry
+        self._cache_put(cache_key, list(documents))
         return documents
 
-    def query_by_embedding(self, query_emb, top_k=10, candidate_doc_ids=None) -> [Document]:
+    def _construct_embedding_query_body(self, query_emb, top_k, candidate_doc_ids):
         if not self.embedding_field:
             raise RuntimeError("Please specify arg `embedding_field` in ElasticsearchDocumentStore()")
+
+        if self.normalize_embeddings:
+            # normalize the query vector once client-side; the documents are normalized at index time
+            # (see write_documents()), so a dot product equals the cosine similarity
+            query_emb = np.asarray(query_emb, dtype=np.float32)
+            norm = np.linalg.norm(query_emb)
+            if norm != 0:
+                query_emb = query_emb / norm
+            query_emb = query_emb.tolist()
+
+        if self.knn_supported:
+            # approximate kNN via HNSW graph traversal (ES >= 8). Scores are already in [0,1],
+            # so no score adjustment is needed here.
+            body = {
+                # size must match k: the search API still caps the response at size (default 10)
+                "size": top_k,
+                "knn": {
+                    "field": self.embedding_field,
+                    "query_vector": query_emb,
+                    "k": top_k,
+                    "num_candidates": max(top_k * 10, 100),
+                }
+            }
+
+            if candidate_doc_ids:
+                body["knn"]["filter"] = [{"terms": {"_id": candidate_doc_ids}}]
+
+            if self._source_excludes:
+                body["_source"] = {"excludes": self._source_excludes}
+
+            return body, 0
         else:
-            # +1 in cosine similarity to avoid negative numbers
+            # brute-force fallback for ES < 8. As both vectors are normalized, dotProduct() gives the
+            # cosine similarity without paying for a norm per document; +1 to avoid negative numbers
             body= {
                 "size": top_k,
                 "query": {
                     "script_score": {
                         "query": {"match_all": {}},
                         "script": {
-                            "source": f"cosineSimilarity(params.query_vector,doc['{self.embedding_field}']) + 1.0",
+                            "id": self._score_script_id,
                             "params": {
                                 "query_vector": query_emb
                             }
@@ -181,29 +427,33 @@ class ElasticsearchDocumentStore(BaseDocumentStore):
                         "filter": [{"terms": {"_id": candidate_doc_ids}}]
                 }}
 
-            if self.excluded_meta_data:
-                body["_source"] = {"excludes": self.excluded_meta_data}
+            if self._source_excludes:
+                body["_source"] = {"excludes": self._source_excludes}
+            body["track_total_hits"] = False
 
-            logger.debug(f"Retriever query: {body}")
-            result = self.client.search(index=self.index, body=body)["hits"]["hits"]
-
-            documents = [self._convert_es_hit_to_document(hit, score_adjustment=-1) for hit in result]
-            return documents
+            return body, -1
 
     def _convert_es_hit_to_document(self, hit, score_adjustment=0) -> Document:
         # We put all additional data of the doc into meta_data and return it in the API
-        meta_data = {k:v for k,v in hit["_source"].items() if k not in (self.text_field, self.external_source_id_field)}
+        source = hit["_source"]
+        meta_data = {k: source[k] for k in source.keys() - self._meta_skip}
         meta_data["name"] = meta_data.pop(self.name_field, None)
+        score = hit.get("_score")
 
         document = Document(
             id=hit["_id"],
-            text=hit["_source"][self.text_field],
-            external_source_id=hit["_source"].get(self.external_source_id_field),
+            text=source[self.text_field],
+            external_source_id=source.get(self.external_source_id_field),
             meta=meta_data,
-            query_score=hit["_score"] + score_adjustment if hit["_score"] else None,
+            query_score=score + score_adjustment if score is not None else None,
         )
         return document
 
+    def _convert_es_hits_to_documents(self, hits, score_adjustment=0) -> [Document]:
+        # bind the conversion method to a local so the attribute lookup is not repeated per hit
+        convert = self._convert_es_hit_to_document
+        return [convert(hit, score_adjustment) for hit in hits]
+
     def add_eval_data(self, filename: str, doc_index: str = "eval_document", label_index: str = "feedback"):
         """
         Adds a SQuAD-formatted file to the DocumentStore in order to be able to perform evaluation on it.
@@ -216,14 +466,14 @@ class ElasticsearchDocumentStore(BaseDocumentStore):
         :type label_index: str
         """
 
-        eval_docs_to_index = []
-        questions_to_index = []
-
         with open(filename, "r") as file:
             data = json.load(file)
+
+        def gen_docs():
+            # yield one action per paragraph instead of materializing the whole list
             for document in data["data"]:
                 for paragraph in document["paragraphs"]:
-                    doc_to_index= {}
+                    doc_to_index = {}
                     id = hash(paragraph["context"])
                     for fieldname, value in paragraph.items():
                         # write docs to doc_index
@@ -232,19 +482,9 @@ class ElasticsearchDocumentStore(BaseDocumentStore):
                             doc_to_index["doc_id"] = str(id)
                             doc_to_index["_op_type"] = "create"
                             doc_to_index["_index"] = doc_index
-                        # write questions to label_index
+                        # questions go to label_index via gen_questions()
                         elif fieldname == "qas":
-                            for qa in value:
-                                question_to_index = {
-                                    "question": qa["question"],
-                                    "answers": qa["answers"],
-                                    "doc_id": str(id),
-                                    "origin": "gold_label",
-                                    "index_name": doc_index,
-                                    "_op_type": "create",
-                                    "_index": label_index
-                                }
-                                questions_to_index.append(question_to_index)
+                            continue
                         # additional fields for docs
                         else:
                             doc_to_index[fieldname] = value
@@ -255,10 +495,34 @@ class ElasticsearchDocumentStore(BaseDocumentStore):
                         elif key != "paragraphs":
                             doc_to_index[key] = value
 
-                    eval_docs_to_index.append(doc_to_index)
+                    yield doc_to_index
 
-        bulk(self.client, eval_docs_to_index)
-        bulk(self.client, questions_to_index)
+        def gen_questions():
+            for document in data["data"]:
+                for paragraph in document["paragraphs"]:
+                    id = hash(paragraph["context"])
+                    for qa in paragraph.get("qas", []):
+                        yield {
+                            "question": qa["question"],
+                            "answers": qa["answers"],
+                            "doc_id": str(id),
+                            "origin": "gold_label",
+                            "index_name": doc_index,
+                            "_op_type": "create",
+                            "_index": label_index
+                        }
+
+        # parallel_bulk consumes the generators lazily, so building the actions overlaps with the
+        # HTTP round trips and peak memory stays at O(chunk_size) rather than O(dataset). It raises
+        # BulkIndexError on failed actions; invalidate the cache even then, as some chunks may have
+        # been indexed already
+        try:
+            for _ in parallel_bulk(self.client, gen_docs(), thread_count=4, chunk_size=500, queue_size=4):
+                pass
+            for _ in parallel_bulk(self.client, gen_questions(), thread_count=4, chunk_size=500, queue_size=4):
+                pass
+        finally:
+            self._invalidate_cache()
 
     def get_all_documents_in_index(self, index, filters=None):
         body = {
@@ -275,4 +539,52 @@ class ElasticsearchDocumentStore(BaseDocumentStore):
            body["query"]["bool"]["filter"] = {"term": filters}
         result = scan(self.client, query=body, index=index)
 
-        return result
\ No newline at end of file
+        return result
+
+class AsyncElasticsearchDocumentStore(ElasticsearchDocumentStore):
+    """
+    Variant of ElasticsearchDocumentStore whose read methods are coroutines, so a pipeline can run
+    several retrievals concurrently (e.g. asyncio.gather() of a BM25 query and an embedding query)
+    and overlap their network round trips. Index management and writes still go through the
+    synchronous client of the parent class. Requires the async extra of elasticsearch-py
+    (pip install 'elasticsearch[async]').
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        from elasticsearch import AsyncElasticsearch  # only available with elasticsearch[async]
+        self.async_client = AsyncElasticsearch(**self._client_kwargs)
+
+    async def query(
+        self,
+        query: str,
+        filters: dict = None,
+        top_k: int = 10,
+        custom_query: str = None,
+        index: str = None,
+    ) -> [Document]:
+
+        if index is None:
+            index = self.index
+
+        body = self._construct_query_body(query, filters, top_k, custom_query)
+        logger.debug(f"Retriever query: {body}")
+        result = (await self.async_client.search(index=index, body=body, request_cache=True))["hits"]["hits"]
+        return self._convert_es_hits_to_documents(result)
+
+    async def query_by_embedding(self, query_emb, top_k=10, candidate_doc_ids=None) -> [Document]:
+        body, score_adjustment = self._construct_embedding_query_body(query_emb, top_k, candidate_doc_ids)
+        logger.debug(f"Retriever query: {body}")
+        result = (await self.async_client.search(index=self.index, body=body))["hits"]["hits"]
+        return self._convert_es_hits_to_documents(result, score_adjustment=score_adjustment)
+
+    async def get_document_by_id(self, id: str) -> Document:
+        try:
+            hit = await self.async_client.get(index=self.index, id=id,
+                                              _source_excludes=self._source_excludes or None)
+        except NotFoundError:
+            return None
+        return self._convert_es_hit_to_document(hit)
+
+    async def close(self):
+        await self.async_client.close()
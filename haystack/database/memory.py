@@ -62,21 +62,37 @@ class InMemoryDocumentStore(BaseDocumentStore):
 
     def query_by_embedding(self, query_emb, top_k=10, candidate_doc_ids=None) -> [Document]:
         from haystack.api import config
-        from numpy import dot
-        from numpy.linalg import norm
+        import numpy as np
 
         embedding_field_name = config.EMBEDDING_FIELD_NAME
         if embedding_field_name is None:
             return []
 
-        if query_emb is None:
+        if query_emb is None or not self.docs:
             return []
 
-        candidate_docs = [self._convert_memory_hit_to_document(
-            (doc, dot(query_emb, doc[embedding_field_name]) / (norm(query_emb) * norm(doc[embedding_field_name]))), doc_id=idx) for idx, doc in self.docs.items()
-        ]
+        # score all docs with a single matrix-vector product on normalized embeddings (= cosine
+        # similarity) instead of a Python loop with two norms per doc
+        doc_ids = list(self.docs.keys())
+        corpus_emb = np.asarray([doc[embedding_field_name] for doc in self.docs.values()], dtype=np.float32)
+        corpus_emb = corpus_emb / np.linalg.norm(corpus_emb, axis=1, keepdims=True)
+
+        query_emb = np.asarray(query_emb, dtype=np.float32)
+        query_emb = query_emb / np.linalg.norm(query_emb)
+
+        scores = corpus_emb @ query_emb
 
-        return sorted(candidate_docs, key=lambda x: x.query_score, reverse=True)[0:top_k]
+        # unordered top-k via argpartition in O(N), then sort only those k
+        top_k = min(top_k, len(scores))
+        top_indices = np.argpartition(-scores, top_k - 1)[:top_k]
+        top_indices = top_indices[np.argsort(-scores[top_indices])]
+
+        return [
+            self._convert_memory_hit_to_document(
+                (self.docs[doc_ids[i]], float(scores[i])), doc_id=doc_ids[i]
+            )
+            for i in top_indices
+        ]
 
     def get_document_ids_by_tags(self, tags):
         """
@@ -1,5 +1,8 @@
 import logging
+from collections import OrderedDict
 from typing import Type
+
+import numpy as np
 from farm.infer import Inferencer
 
 from haystack.database.base import Document, BaseDocumentStore
@@ -103,6 +106,7 @@ class EmbeddingRetriever(BaseRetriever):
         model_format: str = "farm",
         pooling_strategy: str = "reduce_mean",
         emb_extraction_layer: int = -1,
+        embedding_cache_size: int = 10000,
     ):
         """
         TODO
@@ -110,6 +114,7 @@ class EmbeddingRetriever(BaseRetriever):
         :param embedding_model:
         :param gpu:
         :param model_format:
+        :param embedding_cache_size: how many text embeddings to keep in memory (0 disables the cache)
         """
         self.document_store = document_store
         self.model_format = model_format
@@ -117,6 +122,12 @@ class EmbeddingRetriever(BaseRetriever):
         self.pooling_strategy = pooling_strategy
         self.emb_extraction_layer = emb_extraction_layer
 
+        # embedding the same text repeatedly (e.g. across reranking experiments) is the dominant cost,
+        # so keep a bounded text -> embedding cache (int8-quantized, see _quantize) and only run the
+        # model for cache misses
+        self.embedding_cache_size = embedding_cache_size
+        self._emb_cache = OrderedDict()
+
         logger.info(f"Init retriever using embeddings of model {embedding_model}")
         if model_format == "farm" or model_format == "transformers":
             self.embedding_model = Inferencer.load(
@@ -155,6 +166,43 @@ class EmbeddingRetriever(BaseRetriever):
             texts = [texts]
         assert type(texts) == list, "Expecting a list of texts, i.e. create_embeddings(texts=['text1',...])"
 
+        if self.embedding_cache_size <= 0:
+            return self._embed(texts)
+
+        # batch-embed only the texts that are not cached yet
+        misses = list(dict.fromkeys(t for t in texts if t not in self._emb_cache))
+        new_embeddings = dict(zip(misses, self._embed(misses))) if misses else {}
+
+        emb = []
+        for text in texts:
+            if text in new_embeddings:
+                emb.append(new_embeddings[text])
+            else:
+                emb.append(self._dequantize(self._emb_cache[text]))
+                self._emb_cache.move_to_end(text)
+
+        for text, embedding in new_embeddings.items():
+            self._emb_cache[text] = self._quantize(embedding)
+        while len(self._emb_cache) > self.embedding_cache_size:
+            self._emb_cache.popitem(last=False)
+        return emb
+
+    @staticmethod
+    def _quantize(emb):
+        # per-vector int8 quantization: cache entries shrink 4x vs float32 (e.g. 1 KB instead of
+        # 4 KB for a 1024-dim vector) at a precision loss that is negligible for ranking
+        vec = np.asarray(emb, dtype=np.float32)
+        scale = float(np.max(np.abs(vec))) / 127 if vec.size else 1.0
+        if scale == 0:
+            scale = 1.0
+        return np.round(vec / scale).astype(np.int8), scale
+
+    @staticmethod
+    def _dequantize(quantized):
+        vec, scale = quantized
+        return list(vec.astype('float64') * scale)
+
+    def _embed(self, texts: [str]):
         if self.model_format == "farm":
             res = self.embedding_model.inference_from_dicts(dicts=[{"text": t} for t in texts])
             emb = [list(r["vec"]) for r in res] #cast from numpy
@@ -1,6 +1,7 @@
 import logging
-from collections import OrderedDict, namedtuple
+from collections import namedtuple
 
+import numpy as np
 import pandas as pd
 from haystack.database.base import Document
 from haystack.retriever.base import BaseRetriever
@@ -44,7 +45,9 @@ class TfidfRetriever(BaseRetriever):
 
         paragraphs = []
         p_id = 0
+        doc_count = 0  # get_all_documents() may return a generator, so count while iterating
         for doc in documents:
+            doc_count += 1
             for p in doc.text.split("\n\n"):  # TODO: this assumes paragraphs are separated by "\n\n". Can be switched to paragraph tokenizer.
                 if not p.strip():  # skip empty paragraphs
                     continue
@@ -52,29 +55,30 @@ class TfidfRetriever(BaseRetriever):
                     Paragraph(document_id=doc.id, paragraph_id=p_id, text=(p,), meta=doc.meta)
                 )
                 p_id += 1
-        logger.info(f"Found {len(paragraphs)} candidate paragraphs from {len(documents)} docs in DB")
+        logger.info(f"Found {len(paragraphs)} candidate paragraphs from {doc_count} docs in DB")
         return paragraphs
 
     def _calc_scores(self, query):
         question_vector = self.vectorizer.transform([query])
 
-        scores = self.tfidf_matrix.dot(question_vector.T).toarray()
-        idx_scores = [(idx, score) for idx, score in enumerate(scores)]
-        indices_and_scores = OrderedDict(
-            sorted(idx_scores, key=(lambda tup: tup[1]), reverse=True)
-        )
-        return indices_and_scores
+        scores = self.tfidf_matrix.dot(question_vector.T).toarray().ravel()
+        return scores
 
     def retrieve(self, query, filters=None, top_k=10, verbose=True):
         if filters:
             raise NotImplementedError("Filters are not implemented in TfidfRetriever.")
 
         # get scores
-        indices_and_scores = self._calc_scores(query)
-
-        # rank paragraphs
-        df_sliced = self.df.loc[indices_and_scores.keys()]
-        df_sliced = df_sliced[:top_k]
+        scores = self._calc_scores(query)
+
+        # rank paragraphs: select the unordered top_k in O(N) via argpartition, sort only those k,
+        # and slice the dataframe for the top candidates only
+        top_k = min(top_k, len(scores))
+        if top_k == 0:
+            return []
+        top_indices = np.argpartition(-scores, top_k - 1)[:top_k]
+        top_indices = top_indices[np.argsort(-scores[top_indices])]
+        df_sliced = self.df.iloc[top_indices]
 
         if verbose:
             logger.info(
@@ -0,0 +1,85 @@
+from collections import OrderedDict
+
+from haystack.database.elasticsearch import ElasticsearchDocumentStore
+
+
+def _make_store(cache_size=2, cache_ttl=60):
+    # build the store without __init__ so no Elasticsearch connection is needed
+    store = ElasticsearchDocumentStore.__new__(ElasticsearchDocumentStore)
+    store.cache_size = cache_size
+    store.cache_ttl = cache_ttl
+    store._cache = OrderedDict()
+    store._cache_generation = 0
+    return store
+
+
+def test_cache_put_and_get():
+    store = _make_store()
+    key = store._cache_key("document", {"query": "test"})
+
+    assert store._cache_get(key) is None
+    store._cache_put(key, ["result"])
+    assert store._cache_get(key) == ["result"]
+
+
+def test_cache_ttl_expiry():
+    store = _make_store(cache_ttl=60)
+    key = store._cache_key("document", {"query": "test"})
+    store._cache_put(key, ["result"])
+
+    # age the entry beyond the TTL by rewriting its timestamp
+    timestamp, result = store._cache[key]
+    store._cache[key] = (timestamp - 61, result)
+
+    assert store._cache_get(key) is None
+    assert key not in store._cache  # expired entries are dropped on access
+
+
+def test_cache_eviction_at_cache_size():
+    store = _make_store(cache_size=2)
+    keys = [store._cache_key("document", {"query": q}) for q in ("a", "b", "c")]
+    for key in keys:
+        store._cache_put(key, [key])
+
+    assert len(store._cache) == 2
+    assert store._cache_get(keys[0]) is None  # oldest entry was evicted
+    assert store._cache_get(keys[1]) == [keys[1]]
+    assert store._cache_get(keys[2]) == [keys[2]]
+
+
+def test_cache_lru_keeps_recently_used():
+    store = _make_store(cache_size=2)
+    key_a = store._cache_key("document", {"query": "a"})
+    key_b = store._cache_key("document", {"query": "b"})
+    key_c = store._cache_key("document", {"query": "c"})
+
+    store._cache_put(key_a, ["a"])
+    store._cache_put(key_b, ["b"])
+    store._cache_get(key_a)  # refresh a, so b becomes the least recently used
+    store._cache_put(key_c, ["c"])
+
+    assert store._cache_get(key_a) == ["a"]
+    assert store._cache_get(key_b) is None
+    assert store._cache_get(key_c) == ["c"]
+
+
+def test_cache_size_zero_disables_caching():
+    store = _make_store(cache_size=0)
+    key = store._cache_key("document", {"query": "test"})
+    store._cache_put(key, ["result"])
+
+    assert len(store._cache) == 0
+    assert store._cache_get(key) is None
+
+
+def test_cache_invalidation_on_write():
+    store = _make_store()
+    key = store._cache_key("document", {"query": "test"})
+    store._cache_put(key, ["result"])
+
+    store._invalidate_cache()
+
+    # same index and body yield a different key after the generation bump
+    new_key = store._cache_key("document", {"query": "test"})
+    assert new_key != key
+    assert store._cache_get(new_key) is None
@@ -0,0 +1,28 @@
+import numpy as np
+
+from haystack.retriever.elasticsearch import EmbeddingRetriever
+
+
+def test_quantize_roundtrip_error_bound():
+    vec = np.random.RandomState(42).uniform(-1, 1, 1024)
+
+    quantized, scale = EmbeddingRetriever._quantize(vec)
+    assert quantized.dtype == np.int8
+    restored = np.asarray(EmbeddingRetriever._dequantize((quantized, scale)))
+
+    # rounding to int8 steps of size scale keeps every component within half a step
+    assert np.max(np.abs(restored - vec)) <= scale / 2 + 1e-6
+
+
+def test_quantize_zero_vector():
+    quantized, scale = EmbeddingRetriever._quantize([0.0, 0.0, 0.0])
+
+    assert scale == 1.0  # fallback scale, no division by zero
+    assert EmbeddingRetriever._dequantize((quantized, scale)) == [0.0, 0.0, 0.0]
+
+
+def test_quantize_empty_vector():
+    quantized, scale = EmbeddingRetriever._quantize([])
+
+    assert scale == 1.0
+    assert EmbeddingRetriever._dequantize((quantized, scale)) == []
@@ -23,6 +23,34 @@ def test_finder_get_answers_with_in_memory_store():
     assert prediction is not None
 
 
+def test_memory_store_query_by_embedding():
+    test_docs = [
+        {"name": "testing the finder 1", "text": "testing the finder with pyhton unit test 1", "embedding": [1.0, 0.0, 0.0]},
+        {"name": "testing the finder 2", "text": "testing the finder with pyhton unit test 2", "embedding": [0.8, 0.6, 0.0]},
+        {"name": "testing the finder 3", "text": "testing the finder with pyhton unit test 3", "embedding": [0.0, 1.0, 0.0]}
+    ]
+
+    from haystack.database.memory import InMemoryDocumentStore
+    document_store = InMemoryDocumentStore()
+    document_store.write_documents(test_docs)
+
+    from haystack.api import config
+    old_embedding_field_name = config.EMBEDDING_FIELD_NAME
+    config.EMBEDDING_FIELD_NAME = "embedding"
+    try:
+        results = document_store.query_by_embedding([1.0, 0.0, 0.0], top_k=2)
+    finally:
+        config.EMBEDDING_FIELD_NAME = old_embedding_field_name
+
+    # cosine similarities to the query are 1.0, 0.8 and 0.0, so the top 2 docs come back in that order
+    assert [doc.text for doc in results] == [
+        "testing the finder with pyhton unit test 1",
+        "testing the finder with pyhton unit test 2",
+    ]
+    assert abs(results[0].query_score - 1.0) < 1e-6
+    assert abs(results[1].query_score - 0.8) < 1e-6
+
+
 def test_memory_store_get_by_tags():
     test_docs = [
         {"name": "testing the finder 1", "text": "testing the finder with pyhton unit test 1", 'meta': {'url': 'url'}},
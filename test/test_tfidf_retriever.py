@@ -17,3 +17,25 @@ def test_tfidf_retriever():
     retriever = TfidfRetriever(document_store)
     retriever.fit()
     assert retriever.retrieve("godzilla", top_k=1) == [Document(id='0', text='godzilla says hello', external_source_id=None, question=None, query_score=None, meta={})]
+
+
+def test_tfidf_retriever_top_k_ordering():
+    from haystack.retriever.tfidf import TfidfRetriever
+
+    test_docs = [
+        {"name": "testing the finder 1", "text": "godzilla says hello"},
+        {"name": "testing the finder 2", "text": "godzilla godzilla godzilla"},
+        {"name": "testing the finder 3", "text": "alien says arghh"}
+    ]
+
+    from haystack.database.memory import InMemoryDocumentStore
+    document_store = InMemoryDocumentStore()
+    document_store.write_documents(test_docs)
+
+    retriever = TfidfRetriever(document_store)
+    retriever.fit()
+
+    # the argpartition selection must return documents in descending tf-idf score order: the
+    # all-godzilla paragraph scores highest, the non-matching paragraph is cut off by top_k
+    results = retriever.retrieve("godzilla", top_k=2)
+    assert [doc.text for doc in results] == ["godzilla godzilla godzilla", "godzilla says hello"]